@@ -3,12 +3,17 @@
 import sys
 import json
 import os
+import math
 import numpy as np
-import librosa
 import soundfile as sf
 from scipy import signal
 import warnings
 
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
 warnings.filterwarnings('ignore')
 
 TARGET_SAMPLE_RATE = 16000
@@ -17,6 +22,38 @@ SILENCE_THRESHOLD_DB = 30
 SPEECH_FREQ_MIN = 80
 SPEECH_FREQ_MAX = 8000
 
+def as_float32(audio):
+
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+def find_trim_bounds(audio, top_db, frame_length, hop_length):
+
+    if len(audio) < frame_length:
+        return 0, len(audio)
+
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_length)[::hop_length]
+    power = np.mean(np.square(frames, dtype=np.float32), axis=1)
+
+    ref_power = power.max()
+    if ref_power <= 0:
+        return 0, len(audio)
+
+    nonsilent = np.flatnonzero(power > ref_power * 10.0 ** (-top_db / 10.0))
+    if len(nonsilent) == 0:
+        return 0, len(audio)
+
+    start = int(nonsilent[0]) * hop_length
+    end = min(len(audio), int(nonsilent[-1]) * hop_length + frame_length)
+    return start, end
+
+BANDPASS_SOS = signal.butter(
+    N=4,
+    Wn=[SPEECH_FREQ_MIN, min(SPEECH_FREQ_MAX, TARGET_SAMPLE_RATE // 2 - 1)],
+    btype='bandpass',
+    fs=TARGET_SAMPLE_RATE,
+    output='sos'
+).astype(np.float32)
+
 class AudioProcessor:
 
     def __init__(self, input_path, output_path):
@@ -61,12 +98,23 @@ class AudioProcessor:
 
     def load_audio(self):
 
-        audio, sr = librosa.load(self.input_path, sr=None, mono=True)
+        try:
+            audio, sr = sf.read(self.input_path, dtype='float32', always_2d=False)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+        except Exception:
+
+            import librosa
+            audio, sr = librosa.load(self.input_path, sr=None, mono=True)
 
         if sr != TARGET_SAMPLE_RATE:
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=TARGET_SAMPLE_RATE)
+            if soxr is not None:
+                audio = soxr.resample(audio, sr, TARGET_SAMPLE_RATE, quality='HQ')
+            else:
+                gcd = math.gcd(int(sr), TARGET_SAMPLE_RATE)
+                audio = signal.resample_poly(audio, TARGET_SAMPLE_RATE // gcd, sr // gcd)
 
-        self.audio = audio
+        self.audio = as_float32(audio)
         self.sample_rate = TARGET_SAMPLE_RATE
         self.duration = len(audio) / self.sample_rate
 
@@ -74,11 +122,11 @@ class AudioProcessor:
 
     def normalize_volume(self):
 
-        peak = np.abs(self.audio).max()
+        peak = max(self.audio.max(), -self.audio.min())
 
         if peak > 0.95:
 
-            self.audio = self.audio * (0.891 / peak)
+            self.audio *= 0.891 / peak
             print(f"   ✓ Normalized (peak was {peak:.3f})", file=sys.stderr)
         else:
             print(f"   ✓ No normalization needed (peak: {peak:.3f})", file=sys.stderr)
@@ -87,12 +135,28 @@ class AudioProcessor:
 
         original_length = len(self.audio)
 
-        self.audio, _ = librosa.effects.trim(
+        edge = 2048
+        hop = 512
+        if original_length > 2 * edge:
+
+            peak = max(self.audio.max(), -self.audio.min())
+            power_threshold = np.float32(peak) ** 2 * 10.0 ** (-SILENCE_THRESHOLD_DB / 10.0)
+
+            head_power = np.mean(np.square(self.audio[:edge], dtype=np.float32))
+            last_start = ((original_length - edge) // hop) * hop
+            tail_power = np.mean(np.square(self.audio[last_start:last_start + edge], dtype=np.float32))
+
+            if head_power >= power_threshold and tail_power >= power_threshold:
+                print(f"   ✓ No edge silence detected, skipping trim (duration: {self.duration:.2f}s)", file=sys.stderr)
+                return
+
+        start, end = find_trim_bounds(
             self.audio,
             top_db=SILENCE_THRESHOLD_DB,
             frame_length=2048,
             hop_length=512
         )
+        self.audio = self.audio[start:end]
 
         trimmed_samples = original_length - len(self.audio)
         trimmed_seconds = trimmed_samples / self.sample_rate
@@ -102,7 +166,7 @@ class AudioProcessor:
 
     def save_audio(self):
 
-        self.audio = np.clip(self.audio, -1.0, 1.0)
+        np.clip(self.audio, -1.0, 1.0, out=self.audio)
 
         sf.write(
             self.output_path,
@@ -116,13 +180,14 @@ class AudioProcessor:
 
     def calculate_metrics(self):
 
-        rms = np.sqrt(np.mean(self.audio ** 2))
+        rms = np.sqrt(np.dot(self.audio, self.audio) / len(self.audio))
 
-        peak = np.abs(self.audio).max()
+        peak = max(self.audio.max(), -self.audio.min())
 
         crest_factor = peak / (rms + 1e-10)
 
-        zcr = np.sum(librosa.zero_crossings(self.audio)) / len(self.audio)
+        signbit = np.signbit(self.audio)
+        zcr = np.count_nonzero(signbit[1:] != signbit[:-1]) / len(self.audio)
 
         return {
             'rms_level': float(rms),
@@ -172,6 +237,8 @@ class AudioProcessorWithVAD(AudioProcessor):
 
     def apply_vad(self):
 
+        import librosa
+
         intervals = librosa.effects.split(
             self.audio,
             top_db=SILENCE_THRESHOLD_DB,
@@ -183,16 +250,19 @@ class AudioProcessorWithVAD(AudioProcessor):
             print(f"   ⚠ No speech detected, keeping original", file=sys.stderr)
             return
 
-        segments = []
         pause_samples = int(0.2 * self.sample_rate)
 
+        speech_samples = int((intervals[:, 1] - intervals[:, 0]).sum())
+        total_samples = speech_samples + (len(intervals) - 1) * pause_samples
+        output = np.zeros(total_samples, dtype=self.audio.dtype)
+
+        offset = 0
         for start, end in intervals:
-            segments.append(self.audio[start:end])
-            segments.append(np.zeros(pause_samples))
+            length = end - start
+            output[offset:offset + length] = self.audio[start:end]
+            offset += length + pause_samples
 
-        if segments:
-            segments = segments[:-1]
-            self.audio = np.concatenate(segments)
+        self.audio = output
 
         self.duration = len(self.audio) / self.sample_rate
         print(f"   ✓ VAD applied ({len(intervals)} segments, duration: {self.duration:.2f}s)", file=sys.stderr)
@@ -237,23 +307,79 @@ class AudioProcessorWithBandpass(AudioProcessor):
 
     def apply_bandpass(self):
 
-        sos = signal.butter(
-            N=4,
-            Wn=[SPEECH_FREQ_MIN, SPEECH_FREQ_MAX],
-            btype='bandpass',
-            fs=self.sample_rate,
-            output='sos'
-        )
-        self.audio = signal.sosfilt(sos, self.audio)
+        self.audio = as_float32(self.audio)
+        self.audio = as_float32(signal.sosfilt(BANDPASS_SOS, self.audio))
 
         print(f"   ✓ Gentle bandpass applied ({SPEECH_FREQ_MIN}-{SPEECH_FREQ_MAX}Hz)", file=sys.stderr)
 
+PROCESSOR_MODES = {
+    'minimal': AudioProcessor,
+    'vad': AudioProcessorWithVAD,
+    'bandpass': AudioProcessorWithBandpass,
+}
+
+def process_job(job):
+
+    try:
+        mode = job.get('mode', 'minimal').lower()
+
+        output_dir = os.path.dirname(job['output'])
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+        processor_cls = PROCESSOR_MODES.get(mode, AudioProcessor)
+        return processor_cls(job['input'], job['output']).process()
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def run_server():
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            result = process_job(json.loads(line))
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+def process_batch(jobs, workers=None):
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_job, jobs))
+
+def run_batch(manifest_path):
+
+    with open(manifest_path, 'r') as f:
+        jobs = [json.loads(line) for line in f if line.strip()]
+
+    for result in process_batch(jobs):
+        print(json.dumps(result))
+
 def main():
 
     if len(sys.argv) < 2:
         print("Usage: python audio_processor.py <input_file> [output_file] [--optimize]", file=sys.stderr)
         sys.exit(1)
 
+    if sys.argv[1] == 'serve':
+        run_server()
+        return
+
+    if sys.argv[1] == 'batch':
+        if len(sys.argv) < 3:
+            print("Usage: python audio_processor.py batch <manifest.jsonl>", file=sys.stderr)
+            sys.exit(1)
+        run_batch(sys.argv[2])
+        return
+
     input_path = sys.argv[1]
     output_path = sys.argv[2]
     mode = sys.argv[3].lower() if len(sys.argv) > 3 else 'minimal'
@@ -3,14 +3,39 @@ import sys
 import json
 import re
 import os
+from bisect import bisect_right
+from collections import Counter
+from itertools import islice
+import numpy as np
 import spacy
+from spacy.attrs import POS
 from spacy.matcher import Matcher
+from spacy.symbols import VERB, AUX
 import warnings
 from utils import Logger
 warnings.filterwarnings("ignore")
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_json(obj):
+
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def loads_json(data):
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 _MODEL_CACHE = {}
 
+DEFAULT_MODEL = os.environ.get('ECHONOTE_SPACY_MODEL', 'en_core_web_lg')
+
 def get_model(model_name):
 
     if model_name in _MODEL_CACHE:
@@ -34,6 +59,19 @@ def get_model(model_name):
 NOISY_LABELS = {'CARDINAL', 'ORDINAL', 'QUANTITY', 'LANGUAGE'}
 MIN_ENTITY_LENGTH = 2
 
+PRONOUN_WORDS = frozenset({
+    'it', 'he', 'she', 'they', 'we', 'us', 'them',
+    'this', 'that', 'these', 'those'
+})
+
+SUBJECT_DEPS = frozenset({'nsubj', 'nsubjpass'})
+OBJECT_DEPS = frozenset({'dobj', 'pobj', 'attr', 'oprd'})
+CLAUSE_DEPS = frozenset({'xcomp', 'ccomp', 'conj'})
+
+SPEAKER_TAG_RE = re.compile(r'\[?(SPEAKER_\d+|Speaker\s*\d+)\]?:\s*(.*)', re.IGNORECASE)
+NAME_TAG_RE = re.compile(r'([A-Z][a-zA-Z]+):\s*(.*)')
+SPEAKER_STRIP_RE = re.compile(r'(?:\[SPEAKER_\d+\]|Speaker\s*\d+):\s*', re.IGNORECASE)
+
 def filter_entities(entities_raw):
 
     filtered = []
@@ -50,8 +88,7 @@ def filter_entities(entities_raw):
         if text.isdigit():
             continue
 
-        if text.lower() in ('it', 'he', 'she', 'they', 'we', 'us', 'them',
-                            'this', 'that', 'these', 'those'):
+        if text.lower() in PRONOUN_WORDS:
             continue
 
         filtered.append(ent)
@@ -59,19 +96,13 @@ def filter_entities(entities_raw):
 
 def deduplicate_entities(entities_raw):
 
-    counts = {}
-    for ent in entities_raw:
-        key = (ent['text'].strip(), ent['label'])
-        counts[key] = counts.get(key, 0) + 1
+    counts = Counter((ent['text'].strip(), ent['label']) for ent in entities_raw)
 
-    deduplicated = [
+    return [
         {'text': text, 'label': label, 'count': count}
-        for (text, label), count in counts.items()
+        for (text, label), count in counts.most_common()
     ]
 
-    deduplicated.sort(key=lambda x: x['count'], reverse=True)
-    return deduplicated
-
 def parse_with_speaker_context(text):
 
     speaker_segments = []
@@ -83,14 +114,10 @@ def parse_with_speaker_context(text):
         if not line:
             continue
 
-        match = re.match(
-            r'\[?(SPEAKER_\d+|Speaker\s*\d+)\]?:\s*(.*)',
-            line,
-            flags=re.IGNORECASE
-        )
+        match = SPEAKER_TAG_RE.match(line)
         if not match:
 
-            match = re.match(r'([A-Z][a-zA-Z]+):\s*(.*)', line)
+            match = NAME_TAG_RE.match(line)
 
         if match:
             current_speaker = match.group(1).strip()
@@ -114,9 +141,7 @@ def parse_with_speaker_context(text):
     cleaned_text = ' '.join(cleaned_lines)
     return speaker_segments, cleaned_text
 
-def build_speaker_entity_map(speaker_segments, doc):
-
-    speaker_entities = {}
+def build_segment_ranges(speaker_segments):
 
     char_offset = 0
     segment_ranges = []
@@ -131,29 +156,43 @@ def build_speaker_entity_map(speaker_segments, doc):
 
         char_offset = end + 1
 
-    for ent in doc.ents:
+    return segment_ranges
+
+def find_segment_range(segment_ranges, starts, char_index):
+
+    i = bisect_right(starts, char_index) - 1
+    if i >= 0 and char_index < segment_ranges[i]['end']:
+        return segment_ranges[i]
+    return None
+
+def build_speaker_entity_map(segment_ranges, ents):
+
+    speaker_entities = {}
+    starts = [r['start'] for r in segment_ranges]
+
+    for ent in ents:
 
         if ent.label_ in NOISY_LABELS or len(ent.text.strip()) < MIN_ENTITY_LENGTH:
             continue
-        if ent.text.strip().lower() in ('it', 'he', 'she', 'they', 'we'):
+        if ent.text.strip().lower() in PRONOUN_WORDS:
             continue
 
-        for seg_range in segment_ranges:
-            if ent.start_char >= seg_range['start'] and ent.end_char <= seg_range['end']:
-                speaker = seg_range['speaker']
-                if speaker not in speaker_entities:
-                    speaker_entities[speaker] = []
-                entity_str = f"{ent.text.strip()} ({ent.label_})"
-                if entity_str not in speaker_entities[speaker]:
-                    speaker_entities[speaker].append(entity_str)
-                break
+        seg_range = find_segment_range(segment_ranges, starts, ent.start_char)
+        if seg_range is not None and ent.end_char <= seg_range['end']:
+            entity_str = f"{ent.text.strip()} ({ent.label_})"
+            speaker_entities.setdefault(seg_range['speaker'], {})[entity_str] = None
+
+    return {speaker: list(entities) for speaker, entities in speaker_entities.items()}
 
-    return speaker_entities
+_MATCHER_CACHE = {}
 
-def extract_action_signals(doc, speaker_segments, max_signals=15):
+def get_action_matcher(vocab):
 
-    nlp = doc.vocab
-    matcher = Matcher(doc.vocab)
+    matcher = _MATCHER_CACHE.get(id(vocab))
+    if matcher is not None:
+        return matcher
+
+    matcher = Matcher(vocab)
 
     matcher.add("WILL_COMMIT", [
         [{"LOWER": {"IN": ["i", "we"]}}, {"LEMMA": "will"}, {"POS": "VERB"}],
@@ -183,21 +222,17 @@ def extract_action_signals(doc, speaker_segments, max_signals=15):
         [{"LOWER": {"IN": ["i", "we"]}}, {"LEMMA": {"IN": ["can", "could"]}}, {"POS": "VERB"}],
     ])
 
+    _MATCHER_CACHE[id(vocab)] = matcher
+    return matcher
+
+def extract_action_signals(doc, segment_ranges, max_signals=15):
+
+    matcher = get_action_matcher(doc.vocab)
+
     matches = matcher(doc)
     action_signals = []
     seen_spans = set()
-
-    char_offset = 0
-    segment_ranges = []
-    for seg in speaker_segments:
-        start = char_offset
-        end = start + len(seg['text'])
-        segment_ranges.append({
-            'speaker': seg['speaker'],
-            'start': start,
-            'end': end
-        })
-        char_offset = end + 1
+    starts = [r['start'] for r in segment_ranges]
 
     for match_id, start, end in matches:
 
@@ -214,12 +249,9 @@ def extract_action_signals(doc, speaker_segments, max_signals=15):
                 verb = token.lemma_
                 break
 
-        speaker = None
         match_start_char = doc[start].idx
-        for seg_range in segment_ranges:
-            if match_start_char >= seg_range['start'] and match_start_char < seg_range['end']:
-                speaker = seg_range['speaker']
-                break
+        seg_range = find_segment_range(segment_ranges, starts, match_start_char)
+        speaker = seg_range['speaker'] if seg_range is not None else None
 
         if len(span_text) > 120:
             span_text = span_text[:120] + '...'
@@ -242,11 +274,11 @@ QUESTION_STARTERS = frozenset([
     'shall', 'may', 'might'
 ])
 
-def extract_questions(doc, max_questions=10):
+def extract_questions(sentences, max_questions=10):
 
     questions = []
 
-    for sent in doc.sents:
+    for sent in sentences:
         text = sent.text.strip()
         if not text:
             continue
@@ -272,27 +304,28 @@ def extract_svo_triplets(doc, max_triplets=20):
 
     svo_triplets = []
 
-    for token in doc:
+    pos_array = doc.to_array([POS])
+    verb_indices = np.flatnonzero((pos_array == VERB) | (pos_array == AUX))
 
-        if token.pos_ not in ('VERB', 'AUX'):
-            continue
+    for index in verb_indices:
 
+        token = doc[index]
         verb_token = token
-        if token.pos_ == 'AUX':
+        if pos_array[index] == AUX:
             main_verbs = [
                 child for child in token.children
-                if child.dep_ in ('xcomp', 'ccomp', 'conj') and child.pos_ == 'VERB'
+                if child.dep_ in CLAUSE_DEPS and child.pos_ == 'VERB'
             ]
             if main_verbs:
                 verb_token = main_verbs[0]
             else:
                 continue
 
-        subjects = [w for w in verb_token.children if w.dep_ in ('nsubj', 'nsubjpass')]
+        subjects = [w for w in verb_token.children if w.dep_ in SUBJECT_DEPS]
         if not subjects and token != verb_token:
-            subjects = [w for w in token.children if w.dep_ in ('nsubj', 'nsubjpass')]
+            subjects = [w for w in token.children if w.dep_ in SUBJECT_DEPS]
 
-        objects = [w for w in verb_token.children if w.dep_ in ('dobj', 'pobj', 'attr', 'oprd')]
+        objects = [w for w in verb_token.children if w.dep_ in OBJECT_DEPS]
 
         if not subjects:
             for child in verb_token.children:
@@ -303,11 +336,12 @@ def extract_svo_triplets(doc, max_triplets=20):
                             break
 
         if subjects and objects:
-            subj_tokens = list(subjects[0].subtree)[:6]
-            obj_tokens = list(objects[0].subtree)[:8]
-
-            subj_text = " ".join([t.text for t in subj_tokens]).strip()
-            obj_text = " ".join([t.text for t in obj_tokens]).strip()
+            subj_text = " ".join(
+                t.text for t in islice(subjects[0].subtree, 6)
+            ).strip()
+            obj_text = " ".join(
+                t.text for t in islice(objects[0].subtree, 8)
+            ).strip()
 
             if len(subj_text) < 2 or len(obj_text) < 2:
                 continue
@@ -323,50 +357,34 @@ def extract_svo_triplets(doc, max_triplets=20):
 
     return svo_triplets
 
-def process_text(text, model_name):
+def prepare_text(text):
+
+    speaker_segments, cleaned_text = parse_with_speaker_context(text)
+
+    if not speaker_segments and not cleaned_text:
+        cleaned_text = SPEAKER_STRIP_RE.sub('', text).strip()
+
+    return speaker_segments, cleaned_text
+
+def extract_entities(text, model_name):
 
     try:
 
         nlp = get_model(model_name)
 
-        speaker_segments, cleaned_text = parse_with_speaker_context(text)
-
-        if not speaker_segments and not cleaned_text:
-            cleaned_text = re.sub(r'\[SPEAKER_\d+\]:\s*', '', text)
-            cleaned_text = re.sub(r'Speaker\s*\d+:\s*', '', cleaned_text, flags=re.IGNORECASE)
-            cleaned_text = cleaned_text.strip()
+        speaker_segments, cleaned_text = prepare_text(text)
 
-        doc = nlp(cleaned_text)
+        enabled = [p for p in ('tok2vec', 'entity_ruler', 'ner') if nlp.has_pipe(p)]
+        with nlp.select_pipes(enable=enabled):
+            doc = nlp(cleaned_text)
 
         entities_raw = [{'text': ent.text, 'label': ent.label_} for ent in doc.ents]
         entities_filtered = filter_entities(entities_raw)
         entities = deduplicate_entities(entities_filtered)
 
-        svo_triplets = extract_svo_triplets(doc)
-
-        action_signals = extract_action_signals(doc, speaker_segments)
-
-        questions = extract_questions(doc)
-
-        speaker_entity_map = build_speaker_entity_map(speaker_segments, doc)
-
-        sentences = list(doc.sents)
-        metadata = {
-            'sentenceCount': len(sentences),
-            'wordCount': len(doc),
-            'avgSentenceLength': round(
-                sum(len(s) for s in sentences) / max(len(sentences), 1), 1
-            ),
-        }
-
         return {
             'success': True,
             'entities': entities,
-            'svoTriplets': svo_triplets,
-            'actionSignals': action_signals,
-            'questions': questions,
-            'speakerEntityMap': speaker_entity_map,
-            'metadata': metadata,
         }
 
     except Exception as e:
@@ -374,39 +392,164 @@ def process_text(text, model_name):
             'success': False,
             'error': str(e),
             'entities': [],
-            'svoTriplets': [],
-            'actionSignals': [],
-            'questions': [],
-            'speakerEntityMap': {},
-            'metadata': {},
         }
 
+def process_doc(doc, speaker_segments):
+
+    ents = list(doc.ents)
+
+    entities_raw = [{'text': ent.text, 'label': ent.label_} for ent in ents]
+    entities_filtered = filter_entities(entities_raw)
+    entities = deduplicate_entities(entities_filtered)
+
+    svo_triplets = extract_svo_triplets(doc)
+
+    segment_ranges = build_segment_ranges(speaker_segments)
+
+    action_signals = extract_action_signals(doc, segment_ranges)
+
+    sentences = list(doc.sents)
+
+    questions = extract_questions(sentences)
+
+    speaker_entity_map = build_speaker_entity_map(segment_ranges, ents)
+
+    metadata = {
+        'sentenceCount': len(sentences),
+        'wordCount': len(doc),
+        'avgSentenceLength': round(
+            sum(len(s) for s in sentences) / max(len(sentences), 1), 1
+        ),
+    }
+
+    return {
+        'success': True,
+        'entities': entities,
+        'svoTriplets': svo_triplets,
+        'actionSignals': action_signals,
+        'questions': questions,
+        'speakerEntityMap': speaker_entity_map,
+        'metadata': metadata,
+    }
+
+def error_result(error):
+
+    return {
+        'success': False,
+        'error': str(error),
+        'entities': [],
+        'svoTriplets': [],
+        'actionSignals': [],
+        'questions': [],
+        'speakerEntityMap': {},
+        'metadata': {},
+    }
+
+def process_text(text, model_name):
+
+    try:
+
+        nlp = get_model(model_name)
+
+        speaker_segments, cleaned_text = prepare_text(text)
+
+        doc = nlp(cleaned_text)
+
+        return process_doc(doc, speaker_segments)
+
+    except Exception as e:
+        return error_result(e)
+
+def process_texts(texts, model_name, batch_size=32, n_process=1):
+
+    nlp = get_model(model_name)
+
+    prepared = [prepare_text(text) for text in texts]
+
+    results = []
+    docs = nlp.pipe(
+        (cleaned for _, cleaned in prepared),
+        batch_size=batch_size,
+        n_process=n_process
+    )
+    for (speaker_segments, _), doc in zip(prepared, docs):
+        try:
+            results.append(process_doc(doc, speaker_segments))
+        except Exception as e:
+            results.append(error_result(e))
+
+    return results
+
+MODE_DISPATCH = {
+    'full': process_text,
+    'entities': extract_entities,
+}
+
+def run_server(model_name):
+
+    get_model(model_name)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = loads_json(line)
+            mode = request.get('mode', 'full')
+            if 'texts' in request:
+                if mode != 'full':
+                    result = {'success': False, 'error': f'Batch requests only support full mode, got: {mode}'}
+                else:
+                    results = process_texts(
+                        request['texts'],
+                        request.get('model', model_name),
+                        n_process=request.get('n_process', 1)
+                    )
+                    result = {'success': True, 'results': results}
+            else:
+                handler = MODE_DISPATCH.get(mode)
+                if handler is None:
+                    result = {'success': False, 'error': f'Unsupported mode: {mode}'}
+                else:
+                    result = handler(request.get('text', ''), request.get('model', model_name))
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+
+        sys.stdout.write(dumps_json(result) + '\n')
+        sys.stdout.flush()
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         print(json.dumps({'success': False, 'error': 'No input text provided'}))
         sys.exit(1)
 
-    if sys.argv[1] == 'test':
+    if sys.argv[1] == 'serve':
+        run_server(DEFAULT_MODEL)
+    elif sys.argv[1] == 'test':
 
         import platform
         print("🧪 Testing SpaCy installation...", file=sys.stderr)
         with Logger.suppress_stdout():
-            nlp = spacy.load('en_core_web_lg')
+            nlp = get_model(DEFAULT_MODEL)
         print(json.dumps({
             'spacy_version': spacy.__version__,
-            'model': 'en_core_web_lg',
+            'model': DEFAULT_MODEL,
             'model_version': nlp.meta['version'],
             'python_version': platform.python_version(),
             'components': nlp.pipe_names
         }))
     else:
         text = sys.argv[1]
+        if text == '-':
+            text = sys.stdin.read()
         mode = sys.argv[2] if len(sys.argv) > 2 else 'full'
-        model_name = 'en_core_web_lg'
+        model_name = DEFAULT_MODEL
 
-        if mode == 'full':
-            result = process_text(text, model_name)
+        handler = MODE_DISPATCH.get(mode)
+        if handler is not None:
+            result = handler(text, model_name)
         else:
             result = {'success': False, 'error': f'Unsupported mode: {mode}'}
 
-        print(json.dumps(result))
\ No newline at end of file
+        print(dumps_json(result))
\ No newline at end of file
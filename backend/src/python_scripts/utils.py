@@ -1,16 +1,46 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import stat
 import sys
 import json
 import time
 import hashlib
+import mmap
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import numpy as np
 from datetime import datetime, timedelta
 import contextlib
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy_rms
+except ImportError:
+    numpy_rms = None
+
+_rfft = None
+
+def _get_rfft():
+
+    global _rfft
+    if _rfft is None:
+        try:
+            import pyfftw
+            pyfftw.interfaces.cache.enable()
+            pyfftw.interfaces.cache.set_keepalive_time(60)
+            _rfft = pyfftw.interfaces.scipy_fft.rfft
+        except ImportError:
+            from scipy.fft import rfft
+            _rfft = rfft
+    return _rfft
+
 class Logger:
 
     @staticmethod
@@ -62,13 +92,27 @@ class Logger:
             finally:
                 sys.stdout = old_stdout
 
+@lru_cache(maxsize=128)
+def _format_file_size(size_bytes: int) -> str:
+
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    elif size_bytes < 1024 * 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    else:
+        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+
 class FileValidator:
 
-    AUDIO_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.mp4', '.ogg', '.flac']
-    AUDIO_MIME_TYPES = [
+    AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.mp4', '.ogg', '.flac'})
+    AUDIO_MIME_TYPES = frozenset({
         'audio/mpeg', 'audio/mp3', 'audio/wav', 'audio/x-wav',
         'audio/mp4', 'audio/x-m4a', 'audio/ogg', 'audio/flac'
-    ]
+    })
+
+    _SUPPORTED_EXTENSIONS_STR = ', '.join(sorted(AUDIO_EXTENSIONS))
 
     MAX_AUDIO_SIZE = 50 * 1024 * 1024
     MIN_AUDIO_SIZE = 1024
@@ -78,25 +122,27 @@ class FileValidator:
 
         try:
 
-            if not os.path.exists(file_path):
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
                 return {
                     'valid': False,
                     'error': f'File not found: {file_path}'
                 }
 
-            if not os.path.isfile(file_path):
+            if not stat.S_ISREG(file_stat.st_mode):
                 return {
                     'valid': False,
                     'error': f'Not a file: {file_path}'
                 }
 
-            file_size = os.path.getsize(file_path)
-            file_ext = os.path.splitext(file_path)[1].lower()
+            file_size = file_stat.st_size
+            file_ext = Path(file_path).suffix.lower()
 
             if file_ext not in FileValidator.AUDIO_EXTENSIONS:
                 return {
                     'valid': False,
-                    'error': f'Unsupported audio format: {file_ext}. Supported: {", ".join(FileValidator.AUDIO_EXTENSIONS)}'
+                    'error': f'Unsupported audio format: {file_ext}. Supported: {FileValidator._SUPPORTED_EXTENSIONS_STR}'
                 }
 
             if file_size < FileValidator.MIN_AUDIO_SIZE:
@@ -108,7 +154,7 @@ class FileValidator:
             if file_size > FileValidator.MAX_AUDIO_SIZE:
                 return {
                     'valid': False,
-                    'error': f'File too large: {FileValidator.format_file_size(file_size)}. Maximum: {FileValidator.format_file_size(FileValidator.MAX_AUDIO_SIZE)}'
+                    'error': f'File too large: {FileValidator.format_file_size(file_size)}. Maximum: {FileValidator._MAX_STR}'
                 }
 
             return {
@@ -127,14 +173,7 @@ class FileValidator:
     @staticmethod
     def format_file_size(size_bytes: int) -> str:
 
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return _format_file_size(size_bytes)
 
     @staticmethod
     def ensure_directory_exists(directory_path: str) -> bool:
@@ -146,6 +185,51 @@ class FileValidator:
             Logger.error(f"Failed to create directory {directory_path}: {str(e)}")
             return False
 
+FileValidator._MAX_STR = FileValidator.format_file_size(FileValidator.MAX_AUDIO_SIZE)
+
+def _as_float32(audio_array: np.ndarray) -> np.ndarray:
+
+    return np.ascontiguousarray(audio_array, dtype=np.float32)
+
+@lru_cache(maxsize=128)
+def _fast_rfft_len(n: int) -> int:
+
+    from scipy.fft import next_fast_len
+    return next_fast_len(n, real=True)
+
+_audio_stats = None
+_audio_stats_checked = False
+
+def _get_audio_stats():
+
+    global _audio_stats, _audio_stats_checked
+    if not _audio_stats_checked:
+        _audio_stats_checked = True
+        try:
+            from numba import njit, prange
+        except ImportError:
+            return None
+
+        @njit(parallel=True, fastmath=True, cache=True)
+        def _stats(x, threshold):
+
+            sum_sq = 0.0
+            peak = 0.0
+            clipped = 0
+
+            for i in prange(x.size):
+                v = x[i]
+                a = abs(v)
+                sum_sq += v * v
+                peak = max(peak, a)
+                if a >= threshold:
+                    clipped += 1
+
+            return sum_sq, peak, clipped
+
+        _audio_stats = _stats
+    return _audio_stats
+
 class AudioUtils:
 
     @staticmethod
@@ -154,27 +238,59 @@ class AudioUtils:
         return len(audio_array) / sample_rate
 
     @staticmethod
-    def calculate_rms(audio_array: np.ndarray) -> float:
+    def calculate_rms(audio_array: np.ndarray, dtype=None) -> float:
+
+        if audio_array.ndim == 1:
+            audio_array = _as_float32(audio_array)
 
-        return float(np.sqrt(np.mean(audio_array ** 2)))
+        if (numpy_rms is not None and audio_array.ndim == 1
+                and audio_array.dtype == np.float32
+                and audio_array.flags['C_CONTIGUOUS']):
+            return float(numpy_rms.rms(audio_array, audio_array.size)[0])
+
+        if dtype is None:
+            dtype = audio_array.dtype if audio_array.dtype.kind == 'f' else np.float64
+        return float(np.sqrt(np.mean(np.square(audio_array, dtype=dtype))))
 
     @staticmethod
     def calculate_peak(audio_array: np.ndarray) -> float:
 
-        return float(np.abs(audio_array).max())
+        return float(np.abs(_as_float32(audio_array)).max())
+
+    @staticmethod
+    def frame_rms(audio_array: np.ndarray, frame_length: int = 2048, hop_length: int = 512) -> np.ndarray:
+
+        if len(audio_array) < frame_length:
+            frame_length = max(1, len(audio_array))
+
+        frames = np.lib.stride_tricks.sliding_window_view(audio_array, frame_length)[::hop_length]
+        return np.sqrt(np.square(frames, dtype=np.float32).mean(axis=1))
+
+    @staticmethod
+    def frame_peak(audio_array: np.ndarray, frame_length: int = 2048, hop_length: int = 512) -> np.ndarray:
+
+        if len(audio_array) < frame_length:
+            frame_length = max(1, len(audio_array))
+
+        frames = np.lib.stride_tricks.sliding_window_view(audio_array, frame_length)[::hop_length]
+        return np.abs(frames).max(axis=1)
 
     @staticmethod
     def calculate_snr_estimate(audio_array: np.ndarray) -> float:
 
-        from scipy.fft import rfft
+        audio_array = _as_float32(audio_array)
 
-        fft_vals = np.abs(rfft(audio_array))
+        n_fft = _fast_rfft_len(len(audio_array))
+        mags2 = np.square(np.abs(_get_rfft()(audio_array, n=n_fft, workers=-1)))
 
-        signal_threshold = np.percentile(fft_vals, 75)
-        signal_power = np.mean(fft_vals[fft_vals > signal_threshold] ** 2)
+        k_lo = mags2.size // 4
+        k_hi = (3 * mags2.size) // 4
+        if k_lo == 0 or k_hi >= mags2.size:
+            return 0.0
 
-        noise_threshold = np.percentile(fft_vals, 25)
-        noise_power = np.mean(fft_vals[fft_vals < noise_threshold] ** 2)
+        part = np.partition(mags2, [k_lo, k_hi])
+        noise_power = part[:k_lo].mean()
+        signal_power = part[k_hi:].mean()
 
         if noise_power > 0:
             snr_db = 10 * np.log10(signal_power / noise_power)
@@ -182,10 +298,45 @@ class AudioUtils:
 
         return 0.0
 
+    @staticmethod
+    def calculate_snr_estimate_batch(audio_arrays: List[np.ndarray]) -> List[float]:
+
+        if not audio_arrays:
+            return []
+
+        n_fft = _fast_rfft_len(max(len(a) for a in audio_arrays))
+        batch = np.zeros((len(audio_arrays), n_fft), dtype=np.float32)
+        for row, audio in enumerate(audio_arrays):
+            batch[row, :len(audio)] = audio
+
+        mags2 = np.square(np.abs(_get_rfft()(batch, axis=1, workers=-1)))
+
+        k_lo = mags2.shape[1] // 4
+        k_hi = (3 * mags2.shape[1]) // 4
+        if k_lo == 0 or k_hi >= mags2.shape[1]:
+            return [0.0] * len(audio_arrays)
+
+        part = np.partition(mags2, [k_lo, k_hi], axis=1)
+        noise_power = part[:, :k_lo].mean(axis=1)
+        signal_power = part[:, k_hi:].mean(axis=1)
+
+        snr_values = []
+        for noise, sig in zip(noise_power, signal_power):
+            if noise > 0:
+                snr_db = 10 * np.log10(sig / noise)
+                snr_values.append(float(max(0, min(60, snr_db))))
+            else:
+                snr_values.append(0.0)
+
+        return snr_values
+
     @staticmethod
     def detect_clipping(audio_array: np.ndarray, threshold: float = 0.99) -> Dict[str, Any]:
 
-        clipped_samples = np.sum(np.abs(audio_array) >= threshold)
+        audio_array = _as_float32(audio_array)
+
+        clipped_samples = (np.count_nonzero(audio_array >= threshold)
+                           + np.count_nonzero(audio_array <= -threshold))
         total_samples = len(audio_array)
         clipping_percentage = (clipped_samples / total_samples) * 100
 
@@ -199,11 +350,30 @@ class AudioUtils:
     @staticmethod
     def validate_audio_quality(audio_array: np.ndarray, sample_rate: int) -> Dict[str, Any]:
 
+        audio_array = _as_float32(audio_array)
+
         duration = AudioUtils.calculate_duration(audio_array, sample_rate)
-        rms = AudioUtils.calculate_rms(audio_array)
-        peak = AudioUtils.calculate_peak(audio_array)
+
+        audio_stats = _get_audio_stats()
+        if audio_stats is not None and audio_array.ndim == 1:
+            sum_sq, peak, clipped_samples = audio_stats(audio_array, 0.99)
+            total_samples = len(audio_array)
+            rms = float(np.sqrt(sum_sq / total_samples))
+            peak = float(peak)
+            clipping = {
+                'is_clipped': clipped_samples > 0,
+                'clipped_samples': int(clipped_samples),
+                'total_samples': int(total_samples),
+                'clipping_percentage': float((clipped_samples / total_samples) * 100)
+            }
+        else:
+            rms = AudioUtils.calculate_rms(audio_array)
+            peak = AudioUtils.calculate_peak(audio_array)
+            clipping = AudioUtils.detect_clipping(audio_array)
+
         snr = AudioUtils.calculate_snr_estimate(audio_array)
-        clipping = AudioUtils.detect_clipping(audio_array)
+
+        del audio_array
 
         issues = []
         quality_score = 100
@@ -246,6 +416,18 @@ class AudioUtils:
             'passed': len(issues) == 0
         }
 
+_WORD_RE = re.compile(r'\S+')
+_KEYWORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+_SENT_RE = re.compile(r'[.!?]+')
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+                             'abcdefghijklmnopqrstuvwxyz')
+
+_STOP_WORDS = frozenset({
+    'this', 'that', 'these', 'those', 'with', 'from', 'have',
+    'would', 'could', 'should', 'about', 'which', 'their',
+    'there', 'where', 'when', 'what', 'will', 'been', 'were'
+})
+
 class TextUtils:
 
     @staticmethod
@@ -271,14 +453,12 @@ class TextUtils:
     @staticmethod
     def count_words(text: str) -> int:
 
-        return len(text.split())
+        return sum(1 for _ in _WORD_RE.finditer(text))
 
     @staticmethod
     def count_sentences(text: str) -> int:
 
-        import re
-        sentences = re.split(r'[.!?]+', text)
-        return len([s for s in sentences if s.strip()])
+        return sum(1 for s in _SENT_RE.split(text) if s.strip())
 
     @staticmethod
     def calculate_reading_time(text: str, wpm: int = 200) -> int:
@@ -290,19 +470,12 @@ class TextUtils:
     def extract_key_phrases(text: str, top_n: int = 10) -> List[str]:
 
         from collections import Counter
-        import re
 
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-
-        stop_words = {
-            'this', 'that', 'these', 'those', 'with', 'from', 'have',
-            'would', 'could', 'should', 'about', 'which', 'their',
-            'there', 'where', 'when', 'what', 'will', 'been', 'were'
-        }
-
-        words = [w for w in words if w not in stop_words]
-
-        word_counts = Counter(words)
+        word_counts = Counter()
+        for match in _KEYWORD_RE.finditer(text.translate(_ASCII_LOWER)):
+            word = match.group()
+            if word not in _STOP_WORDS:
+                word_counts[word] += 1
 
         return [word for word, _ in word_counts.most_common(top_n)]
 
@@ -337,10 +510,20 @@ class TimeUtils:
         else:
             return f"{minutes:02d}:{secs:02d}"
 
+    _last_timestamp = [-1.0, '']
+
     @staticmethod
-    def get_current_timestamp() -> str:
+    def get_current_timestamp(precise: bool = False) -> str:
+
+        if precise:
+            return datetime.now().isoformat()
 
-        return datetime.now().isoformat()
+        cache = TimeUtils._last_timestamp
+        now = time.monotonic()
+        if cache[0] < 0 or now - cache[0] >= 1.0:
+            cache[0] = now
+            cache[1] = datetime.now().isoformat()
+        return cache[1]
 
 class JsonUtils:
 
@@ -372,23 +555,40 @@ class JsonUtils:
 
         return response
 
+    @staticmethod
+    def dumps_bytes(data: Any) -> bytes:
+
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(data, indent=None, ensure_ascii=False).encode('utf-8')
+
     @staticmethod
     def output_json(data: Dict[str, Any]):
 
-        print(json.dumps(data, indent=None, ensure_ascii=False))
+        buffer = sys.stdout.buffer
+        buffer.write(JsonUtils.dumps_bytes(data))
+        buffer.write(b'\n')
+        buffer.flush()
 
 class HashUtils:
 
     @staticmethod
     def file_hash(file_path: str, algorithm: str = 'sha256') -> str:
 
-        hash_func = hashlib.new(algorithm)
+        with open(file_path, 'rb', buffering=0) as f:
 
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hash_func.update(chunk)
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algorithm).hexdigest()
 
-        return hash_func.hexdigest()
+            hash_func = hashlib.new(algorithm)
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hash_func.update(mapped)
+            except ValueError:
+                while chunk := f.read(1024 * 1024):
+                    hash_func.update(chunk)
+
+            return hash_func.hexdigest()
 
     @staticmethod
     def text_hash(text: str, algorithm: str = 'sha256') -> str:
@@ -441,16 +641,16 @@ def ensure_output_directory(output_path: str) -> bool:
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
 
-    try:
-        if denominator == 0:
-            return default
-        return numerator / denominator
-    except:
-        return default
+    return default if denominator == 0 else numerator / denominator
 
 def clamp(value: float, min_val: float, max_val: float) -> float:
 
-    return max(min_val, min(max_val, value))
+    if isinstance(value, np.ndarray):
+        return np.clip(value, min_val, max_val)
+
+    if value < min_val:
+        return min_val
+    return max_val if value > max_val else value
 
 __all__ = [
     'Logger',